@@ -4,27 +4,33 @@
 Monitors Google Calendar for events and stores them in standardized MemoryOS schema.
 """
 import os
-import json
 import hashlib
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-import pickle
+
+import orjson
 
 # Google Calendar API libraries
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 
 # Configuration
 SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
-TOKEN_FILE = 'token.pickle'
+TOKEN_FILE = 'token.json'
 CREDENTIALS_FILE = 'credentials.json'
+SYNC_TOKEN_FILE = '.sync_token'
+SCANNED_UNTIL_FILE = '.scanned_until'
 POLL_INTERVAL = 300  # Check every 5 minutes (300 seconds)
 LOOKAHEAD_DAYS = 30  # Look ahead 30 days for events
+WINDOW_RESCAN_HOURS = 24  # How often to scan for events entering the lookahead window
 DATA_STORAGE = Path(__file__).parent.parent.parent / "Data_Storage"
 EVENTS_DIR = DATA_STORAGE / "Calendar" / "events"
-METADATA_FILE = DATA_STORAGE / "Calendar" / "metadata.json"
+METADATA_FILE = DATA_STORAGE / "Calendar" / "metadata.jsonl"
+LEGACY_METADATA_FILE = DATA_STORAGE / "Calendar" / "metadata.json"
 
 
 class CalendarWatcher:
@@ -37,27 +43,67 @@ class CalendarWatcher:
         self.metadata_file = METADATA_FILE
         self.credentials_file = self.base_dir / CREDENTIALS_FILE
         self.token_file = self.base_dir / TOKEN_FILE
+        self.sync_token_file = self.base_dir / SYNC_TOKEN_FILE
+        self.scanned_until_file = self.base_dir / SCANNED_UNTIL_FILE
 
         self.service = None
-        self.seen_events = {}  # event_id: last_seen_timestamp
+        self.sync_token = self._load_sync_token()
+        self.scanned_until = self._load_scanned_until()
+        self.total_events = 0
 
         self._setup_directories()
         self._authenticate()
 
+        # 'primary' resolves server-side to the user's primary calendar, so no
+        # calendarList() round trip is needed
+        self.calendar_id = 'primary'
+
     def _setup_directories(self):
         """Create necessary directories."""
         self.events_dir.mkdir(parents=True, exist_ok=True)
+        self._migrate_legacy_metadata()
         print(f"[CalendarWatcher] Events -> {self.events_dir.absolute()}")
         print(f"[CalendarWatcher] Metadata -> {self.metadata_file.absolute()}")
 
+    def _migrate_legacy_metadata(self):
+        """One-shot conversion of the legacy metadata.json array to metadata.jsonl."""
+        if not LEGACY_METADATA_FILE.exists() or self.metadata_file.exists():
+            return
+
+        try:
+            metadata = orjson.loads(LEGACY_METADATA_FILE.read_bytes())
+            if not isinstance(metadata, list):
+                raise ValueError("expected a JSON array")
+        except ValueError as e:
+            invalid_path = LEGACY_METADATA_FILE.with_name(LEGACY_METADATA_FILE.name + '.invalid')
+            os.replace(LEGACY_METADATA_FILE, invalid_path)
+            print(f"[CalendarWatcher] Legacy metadata is not valid ({e}), moved to {invalid_path}")
+            return
+
+        self._atomic_write(
+            self.metadata_file,
+            b"".join(orjson.dumps(entry) + b"\n" for entry in metadata)
+        )
+
+        LEGACY_METADATA_FILE.unlink()
+        print(f"[CalendarWatcher] Migrated {len(metadata)} entries to {self.metadata_file}")
+
+    def _atomic_write(self, path: Path, data: bytes):
+        """Write to a .new file, fsync, then rename over the target."""
+        tmp_path = path.with_name(path.name + '.new')
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
     def _authenticate(self):
         """Authenticate with Google Calendar API."""
         creds = None
 
         # Load existing token if available
         if self.token_file.exists():
-            with open(self.token_file, 'rb') as token:
-                creds = pickle.load(token)
+            creds = Credentials.from_authorized_user_file(str(self.token_file), SCOPES)
 
         # If no valid credentials, get new ones
         if not creds or not creds.valid:
@@ -83,30 +129,60 @@ class CalendarWatcher:
                 creds = flow.run_local_server(port=0)
 
             # Save credentials for next run
-            with open(self.token_file, 'wb') as token:
-                pickle.dump(creds, token)
+            self.token_file.write_text(creds.to_json(), encoding='utf-8')
 
         self.service = build('calendar', 'v3', credentials=creds)
         print("[CalendarWatcher] Authenticated with Google Calendar")
 
-    def _get_calendar_id(self):
-        """Get the primary calendar ID."""
+    def _load_sync_token(self):
+        """Load the persisted incremental sync token, if any."""
+        if self.sync_token_file.exists():
+            return self.sync_token_file.read_text(encoding='utf-8').strip() or None
+        return None
+
+    def _save_sync_token(self, token):
+        """Persist the sync token so restarts resume from the last sync."""
+        self.sync_token = token
+        if token:
+            self._atomic_write(self.sync_token_file, token.encode('utf-8'))
+        else:
+            self.sync_token_file.unlink(missing_ok=True)
+
+    def _load_scanned_until(self):
+        """Load the end of the lookahead window already scanned, if any."""
+        if self.scanned_until_file.exists():
+            try:
+                return datetime.fromisoformat(self.scanned_until_file.read_text(encoding='utf-8').strip())
+            except ValueError:
+                return None
+        return None
+
+    def _save_scanned_until(self, scanned_until: datetime):
+        """Persist how far ahead the calendar has been scanned."""
+        self.scanned_until = scanned_until
+        self._atomic_write(self.scanned_until_file, scanned_until.isoformat().encode('utf-8'))
+
+    def _parse_event_time(self, value: dict):
+        """Parse an event start/end ({'dateTime'} or all-day {'date'}) as aware UTC."""
+        raw = value.get('dateTime') or value.get('date')
+        if not raw:
+            return None
         try:
-            calendar_list = self.service.calendarList().list().execute()
-            for calendar in calendar_list.get('items', []):
-                if calendar.get('primary'):
-                    return calendar['id']
-            return 'primary'  # Default to primary
-        except Exception as e:
-            print(f"[CalendarWatcher] Error getting calendar: {e}")
-            return 'primary'
-
-    def _is_duplicate(self, event_id: str, event_hash: str) -> bool:
-        """Check if event has already been captured."""
-        if event_id in self.seen_events:
-            return True
-        self.seen_events[event_id] = datetime.now()
-        return False
+            parsed = datetime.fromisoformat(raw.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+        if parsed.tzinfo is None:
+            # All-day events carry a bare date
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed
+
+    def _in_window(self, event, window_start: datetime, window_end: datetime) -> bool:
+        """Same overlap rule the API applies for timeMin/timeMax."""
+        start = self._parse_event_time(event.get('start', {}))
+        end = self._parse_event_time(event.get('end', {})) or start
+        if start is None:
+            return False
+        return end > window_start and start < window_end
 
     def _create_event_hash(self, event):
         """Create unique hash for event to detect changes."""
@@ -114,10 +190,11 @@ class CalendarWatcher:
         return hashlib.md5(hash_data.encode()).hexdigest()
 
     def _save_event(self, event, calendar_id: str):
-        """Save event to individual JSON file and update metadata."""
+        """Save event to individual JSON file and return its metadata entry."""
         event_id = event.get('id', 'unknown')
         event_hash = self._create_event_hash(event)
-        timestamp = datetime.now().isoformat()
+        now = datetime.now()
+        timestamp = now.isoformat()
 
         # Extract event data
         event_data = {
@@ -141,11 +218,10 @@ class CalendarWatcher:
         }
 
         # Save individual event file
-        event_filename = f"event_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{event_hash[:8]}.json"
+        event_filename = f"event_{now:%Y%m%d_%H%M%S}_{event_hash[:8]}.json"
         event_path = self.events_dir / event_filename
 
-        with open(event_path, 'w', encoding='utf-8') as f:
-            json.dump(event_data, f, indent=2, ensure_ascii=False)
+        event_path.write_bytes(orjson.dumps(event_data, option=orjson.OPT_INDENT_2))
 
         # Create metadata entry (MemoryOS standard schema)
         metadata_entry = {
@@ -165,66 +241,141 @@ class CalendarWatcher:
             }
         }
 
-        # Update metadata.json
-        self._update_metadata(metadata_entry)
-
-        return event_filename
-
-    def _update_metadata(self, entry):
-        """Append entry to metadata.json."""
-        metadata = []
-
-        if self.metadata_file.exists():
-            with open(self.metadata_file, 'r', encoding='utf-8') as f:
-                try:
-                    metadata = json.load(f)
-                except json.JSONDecodeError:
-                    metadata = []
-
-        metadata.append(entry)
+        return metadata_entry
 
-        with open(self.metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+    def _update_metadata(self, entries):
+        """Append a batch of entries to metadata.jsonl in a single write."""
+        if not entries:
+            return
 
-    def _fetch_events(self):
-        """Fetch events from Google Calendar."""
-        calendar_id = self._get_calendar_id()
+        with open(self.metadata_file, 'ab', buffering=1 << 16) as f:
+            f.writelines(orjson.dumps(entry) + b"\n" for entry in entries)
 
-        # Calculate time range
-        now = datetime.utcnow()
-        time_min = now.isoformat() + 'Z'
-        time_max = (now + timedelta(days=LOOKAHEAD_DAYS)).isoformat() + 'Z'
+    def _list_events(self, calendar_id: str, **query):
+        """Run one events().list query across all pages. Returns (events, next_sync_token)."""
+        events = []
+        page_token = None
 
-        try:
+        while True:
             events_result = self.service.events().list(
                 calendarId=calendar_id,
-                timeMin=time_min,
-                timeMax=time_max,
                 singleEvents=True,
-                orderBy='startTime'
+                pageToken=page_token,
+                **query
             ).execute()
 
-            return events_result.get('items', [])
+            events.extend(events_result.get('items', []))
+            page_token = events_result.get('nextPageToken')
+            if not page_token:
+                # nextSyncToken is only present on the last page
+                return events, events_result.get('nextSyncToken')
+
+    def _fetch_events(self, calendar_id: str, window_start: datetime, window_end: datetime):
+        """
+        Fetch events from Google Calendar.
+        The first sync scans the lookahead window; later syncs use the sync
+        token so only events changed since the previous poll are returned,
+        filtered to the same window.
+        Returns (events, next_sync_token, scanned_until); scanned_until is
+        set only when the whole window was scanned.
+        """
+        try:
+            if self.sync_token:
+                events, next_sync_token = self._list_events(calendar_id, syncToken=self.sync_token)
+                # Sync results are not windowed: drop edits to past and far-future events
+                events = [e for e in events if self._in_window(e, window_start, window_end)]
+                return events, next_sync_token, None
+
+            events, next_sync_token = self._list_events(
+                calendar_id,
+                timeMin=window_start.isoformat(),
+                timeMax=window_end.isoformat(),
+            )
+            return events, next_sync_token, window_end
+
+        except HttpError as e:
+            if e.resp.status == 410 and self.sync_token:
+                # Token expired or invalidated by the server: full resync
+                print("[CalendarWatcher] Sync token expired, running full sync")
+                self._save_sync_token(None)
+                return self._fetch_events(calendar_id, window_start, window_end)
+            print(f"[CalendarWatcher] Error fetching events: {e}")
+            return [], None, None
 
         except Exception as e:
             print(f"[CalendarWatcher] Error fetching events: {e}")
-            return []
+            return [], None, None
+
+    def _fetch_window_extension(self, calendar_id: str, window_start: datetime, window_end: datetime):
+        """
+        Fetch events that moved into the lookahead window since the last scan.
+        Incremental sync only reports edits, so an untouched event that was
+        beyond the window at the previous scan would otherwise never be seen.
+        Returns None on error so the scan is retried on the next poll.
+        """
+        scan_from = max(self.scanned_until or window_start, window_start)
+        try:
+            events, _ = self._list_events(
+                calendar_id,
+                timeMin=scan_from.isoformat(),
+                timeMax=window_end.isoformat(),
+            )
+        except Exception as e:
+            print(f"[CalendarWatcher] Error scanning lookahead window: {e}")
+            return None
+
+        if self.scanned_until is None:
+            return events
+
+        # Events straddling the previous window end were captured by the last scan
+        return [
+            e for e in events
+            if (self._parse_event_time(e.get('start', {})) or scan_from) >= scan_from
+        ]
 
     def poll_once(self):
-        """Poll calendar once for new events."""
+        """Poll calendar once for new or changed events."""
         print(f"\n[CalendarWatcher] Polling for events...")
 
-        events = self._fetch_events()
-        new_events = 0
+        window_start = datetime.now(timezone.utc)
+        window_end = window_start + timedelta(days=LOOKAHEAD_DAYS)
+
+        events, next_sync_token, scanned_until = self._fetch_events(
+            self.calendar_id, window_start, window_end
+        )
+
+        # Once a day, pick up events that have entered the lookahead window
+        rescan_due = (
+            self.scanned_until is None
+            or window_end - self.scanned_until >= timedelta(hours=WINDOW_RESCAN_HOURS)
+        )
+        if scanned_until is None and rescan_due:
+            entered = self._fetch_window_extension(self.calendar_id, window_start, window_end)
+            if entered is not None:
+                seen_ids = {e.get('id') for e in events}
+                events.extend(e for e in entered if e.get('id') not in seen_ids)
+                scanned_until = window_end
+
+        pending = []
 
         for event in events:
-            event_id = event.get('id')
-            event_hash = self._create_event_hash(event)
+            # Incremental syncs also report deleted events
+            if event.get('status') == 'cancelled':
+                continue
+
+            pending.append(self._save_event(event, self.calendar_id))
+            print(f"  -> Captured: {event.get('summary', 'No Title')} ({event.get('start', {}).get('dateTime', 'No date')})")
+
+        # One metadata write per poll instead of one per event
+        self._update_metadata(pending)
+        new_events = len(pending)
+        self.total_events += new_events
 
-            if not self._is_duplicate(event_id, event_hash):
-                event_file = self._save_event(event, self._get_calendar_id())
-                print(f"  -> Captured: {event.get('summary', 'No Title')} ({event.get('start', {}).get('dateTime', 'No date')})")
-                new_events += 1
+        # Only advance the sync token and scanned window once the events are on disk
+        if next_sync_token:
+            self._save_sync_token(next_sync_token)
+        if scanned_until:
+            self._save_scanned_until(scanned_until)
 
         if new_events == 0:
             print(f"  -> No new events found")
@@ -237,18 +388,17 @@ class CalendarWatcher:
         """Run continuous polling loop."""
         print(f"\n[CalendarWatcher] Started monitoring calendar")
         print(f"[CalendarWatcher] Poll interval: {POLL_INTERVAL}s")
-        print(f"[CalendarWatcher] Lookahead: {LOOKAHEAD_DAYS} days")
+        print(f"[CalendarWatcher] Lookahead: {LOOKAHEAD_DAYS} days (window rescanned every {WINDOW_RESCAN_HOURS}h)")
         print("[CalendarWatcher] Press Ctrl+C to stop\n")
 
         try:
             while True:
                 self.poll_once()
-                import time
                 time.sleep(POLL_INTERVAL)
 
         except KeyboardInterrupt:
             print(f"\n[CalendarWatcher] Stopped by user")
-            print(f"[CalendarWatcher] Total events captured: {len(self.seen_events)}")
+            print(f"[CalendarWatcher] Total events captured: {self.total_events}")
 
 
 def main():
@@ -0,0 +1,164 @@
+"""
+Tests for the calendar watcher's incremental sync and lookahead window
+Run with: pytest Data_Layer/Data_Collection/Calendar
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+import calendar_watcher
+from calendar_watcher import CalendarWatcher, LOOKAHEAD_DAYS
+
+
+class FakeRequest:
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self):
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+class FakeEvents:
+    """Stand-in for service.events(); `respond` maps list() kwargs to a page."""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.calls = []
+
+    def list(self, **kwargs):
+        self.calls.append(kwargs)
+        return FakeRequest(self.respond(kwargs))
+
+
+class FakeService:
+    def __init__(self, respond):
+        self.fake_events = FakeEvents(respond)
+
+    def events(self):
+        return self.fake_events
+
+
+def make_event(event_id, start, hours=1):
+    return {
+        "id": event_id,
+        "summary": event_id,
+        "updated": "2026-01-01T00:00:00Z",
+        "start": {"dateTime": start.isoformat()},
+        "end": {"dateTime": (start + timedelta(hours=hours)).isoformat()},
+    }
+
+
+@pytest.fixture
+def watcher(tmp_path, monkeypatch):
+    """Watcher with temp storage and no Google authentication."""
+    storage = tmp_path / "Calendar"
+    monkeypatch.setattr(calendar_watcher, "EVENTS_DIR", storage / "events")
+    monkeypatch.setattr(calendar_watcher, "METADATA_FILE", storage / "metadata.jsonl")
+    monkeypatch.setattr(calendar_watcher, "LEGACY_METADATA_FILE", storage / "metadata.json")
+    monkeypatch.setattr(CalendarWatcher, "_authenticate", lambda self: None)
+    return CalendarWatcher(base_dir=tmp_path)
+
+
+def test_in_window_uses_api_overlap_rule(watcher):
+    start = datetime(2026, 10, 15, 12, tzinfo=timezone.utc)
+    end = start + timedelta(days=LOOKAHEAD_DAYS)
+
+    assert watcher._in_window(make_event("soon", start + timedelta(days=1)), start, end)
+    assert watcher._in_window(make_event("running", start - timedelta(minutes=30)), start, end)
+    assert not watcher._in_window(make_event("past", start - timedelta(days=1)), start, end)
+    assert not watcher._in_window(make_event("later", end + timedelta(days=1)), start, end)
+    assert watcher._in_window(
+        {"start": {"date": "2026-10-20"}, "end": {"date": "2026-10-21"}}, start, end
+    )
+    assert not watcher._in_window({"id": "gone", "status": "cancelled"}, start, end)
+
+
+def test_first_sync_scans_window_and_stores_tokens(watcher):
+    soon = datetime.now(timezone.utc) + timedelta(days=1)
+    watcher.service = FakeService(lambda q: {"items": [make_event("a", soon)], "nextSyncToken": "tok1"})
+
+    assert watcher.poll_once() == 1
+
+    call = watcher.service.fake_events.calls[0]
+    assert "timeMin" in call and "timeMax" in call and "syncToken" not in call
+    assert watcher.sync_token_file.read_text(encoding="utf-8") == "tok1"
+    assert watcher.scanned_until is not None
+
+
+def test_incremental_sync_drops_events_outside_window(watcher):
+    now = datetime.now(timezone.utc)
+    watcher._save_sync_token("tok1")
+    watcher._save_scanned_until(now + timedelta(days=LOOKAHEAD_DAYS))
+    items = [
+        make_event("past", now - timedelta(days=3)),
+        make_event("inside", now + timedelta(days=2)),
+        make_event("far", now + timedelta(days=LOOKAHEAD_DAYS + 5)),
+    ]
+    watcher.service = FakeService(lambda q: {"items": items, "nextSyncToken": "tok2"})
+
+    assert watcher.poll_once() == 1
+
+    assert watcher.service.fake_events.calls == [
+        {"calendarId": "primary", "singleEvents": True, "pageToken": None, "syncToken": "tok1"}
+    ]
+    assert watcher.sync_token == "tok2"
+
+
+def test_window_rescan_picks_up_events_entering_window(watcher):
+    now = datetime.now(timezone.utc)
+    previous_end = now + timedelta(days=LOOKAHEAD_DAYS - 2)
+    watcher._save_sync_token("tok1")
+    watcher._save_scanned_until(previous_end)
+
+    def respond(query):
+        if "syncToken" in query:
+            return {"items": [], "nextSyncToken": "tok2"}
+        return {"items": [
+            # Straddles the previous window end, so the last scan already saw it
+            make_event("straddling", previous_end - timedelta(hours=1), hours=3),
+            make_event("entered", previous_end + timedelta(days=1)),
+        ]}
+
+    watcher.service = FakeService(respond)
+
+    assert watcher.poll_once() == 1
+
+    rescan = watcher.service.fake_events.calls[1]
+    assert datetime.fromisoformat(rescan["timeMin"]) == previous_end
+    assert watcher.scanned_until > previous_end
+
+
+def test_expired_sync_token_triggers_full_resync(watcher):
+    soon = datetime.now(timezone.utc) + timedelta(days=1)
+    watcher._save_sync_token("stale")
+    watcher._save_scanned_until(soon + timedelta(days=LOOKAHEAD_DAYS))
+
+    def respond(query):
+        if "syncToken" in query:
+            return HttpError(httplib2.Response({"status": 410}), b"Gone")
+        return {"items": [make_event("a", soon)], "nextSyncToken": "fresh"}
+
+    watcher.service = FakeService(respond)
+
+    assert watcher.poll_once() == 1
+
+    calls = watcher.service.fake_events.calls
+    assert "syncToken" in calls[0] and "timeMin" in calls[1]
+    assert watcher.sync_token_file.read_text(encoding="utf-8") == "fresh"
+
+
+def test_pages_are_followed_until_sync_token(watcher):
+    soon = datetime.now(timezone.utc) + timedelta(days=1)
+    pages = {
+        None: {"items": [make_event("a", soon)], "nextPageToken": "p2"},
+        "p2": {"items": [make_event("b", soon)], "nextSyncToken": "tok1"},
+    }
+    watcher.service = FakeService(lambda q: pages[q["pageToken"]])
+
+    assert watcher.poll_once() == 2
+    assert watcher.sync_token == "tok1"
@@ -6,35 +6,49 @@ Cross-platform: Windows (primary), macOS/Linux fallbacks noted.
 """
 
 import os
-import json
+import ctypes
+import io
 import time
-import hashlib
 import re
-import threading
-from datetime import datetime, timedelta
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
-from urllib.parse import urlparse
 
 # Core dependencies
+import orjson
 import pyperclip
-from PIL import ImageGrab, Image
+import xxhash
+from PIL import BmpImagePlugin, ImageGrab, Image, PngImagePlugin
 
 # Windows-specific clipboard formats
 try:
+    import win32api
     import win32clipboard
+    import win32con
+    import win32event
+    import win32gui
     WINDOWS_SUPPORT = True
 except ImportError:
     WINDOWS_SUPPORT = False
 
 # Configuration
-POLL_INTERVAL = 1.0  # seconds
+POLL_INTERVAL = 1.0  # seconds (fallback when clipboard notifications are unavailable)
+WM_CLIPBOARDUPDATE = 0x031D
 DEDUP_WINDOW = 5.0  # seconds - skip identical content within this window
 DATA_STORAGE = Path(__file__).parent.parent.parent / "Data_Storage"
-METADATA_FILE = DATA_STORAGE / "Clipboard" / "metadata.json"
+METADATA_FILE = DATA_STORAGE / "Clipboard" / "metadata.jsonl"
+LEGACY_METADATA_FILE = DATA_STORAGE / "Clipboard" / "metadata.json"
 IMAGES_FOLDER = DATA_STORAGE / "Clipboard" / "images"
 FILES_FOLDER = DATA_STORAGE / "Clipboard" / "files"
 COPIED_FILES_FOLDER = DATA_STORAGE / "Clipboard" / "copied_files"
 CONTENT_PREVIEW_LENGTH = 200
+COPY_WORKERS = 8  # max parallel file copies per clipboard file list
+PNG_COMPRESS_LEVEL = 1  # fast zlib level - clipboard snapshots, not archives
+
+# URL patterns, compiled once at import (schemes are case-insensitive)
+URL_RE = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]+', re.IGNORECASE)
+URL_ONLY_RE = re.compile(r'https?://[^\s]+', re.IGNORECASE)
 
 
 class ClipboardWatcher:
@@ -53,17 +67,27 @@ class ClipboardWatcher:
         self.copied_files_dir = COPIED_FILES_FOLDER
         self.metadata_path = METADATA_FILE
 
-        # Deduplication tracking: {content_hash: timestamp}
+        # Deduplication tracking: content hash -> time.monotonic() of capture
         self.recent_captures = {}
+        self.captures_pruned_at = time.monotonic()
 
         # Last clipboard state to detect changes
         self.last_text = None
         self.last_image_hash = None
         self.last_files_hash = None
+        self.last_clipboard_seq = None  # Windows clipboard sequence number
+
+        # Registered "PNG" format browsers and Office put on the clipboard (keeps alpha)
+        self.png_format = win32clipboard.RegisterClipboardFormat("PNG") if WINDOWS_SUPPORT else None
 
         # Setup directories
         self._setup_directories()
 
+        # Filename counter - keeps names unique for captures within one second.
+        # Every minted name gets a metadata line, so seeding from the line count
+        # stays ahead of the previous run even after a restart in the same second.
+        self._seq = self._count_metadata_entries()
+
     def _setup_directories(self):
         """Create required folder structure on startup."""
         try:
@@ -74,9 +98,9 @@ class ClipboardWatcher:
             # Create data/text directory for metadata
             self.metadata_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # Initialize metadata file if it doesn't exist
-            if not self.metadata_path.exists():
-                self._write_metadata([])
+            # Convert a legacy JSON array log to JSON Lines, then make sure the log exists
+            self._migrate_legacy_metadata()
+            self.metadata_path.touch(exist_ok=True)
 
             print(f"[ClipboardWatcher] Initialized at {self.base_dir}")
             print(f"[ClipboardWatcher] Images -> {self.images_dir}")
@@ -88,72 +112,109 @@ class ClipboardWatcher:
             raise
 
     def _generate_content_hash(self, content: str | bytes) -> str:
-        """Generate MD5 hash for deduplication."""
+        """Generate xxh3 hash for deduplication."""
         if isinstance(content, str):
             content_bytes = content.encode('utf-8')
         else:
             content_bytes = content
 
-        return hashlib.md5(content_bytes).hexdigest()
+        return xxhash.xxh3_64(content_bytes).hexdigest()
+
+    def _mint_filename(self, prefix: str, ext: str, now: datetime) -> str:
+        """Build a unique capture filename from the capture time: prefix_YYYYmmdd_HHMMSS_<seq>.ext"""
+        self._seq += 1
+        return f"{prefix}_{now:%Y%m%d_%H%M%S}_{self._seq:06d}.{ext}"
+
+    def _hash_file_list(self, files: list) -> str:
+        """Hash a file list incrementally (order-independent) without joining it."""
+        h = xxhash.xxh3_64()
+        for path in sorted(files):
+            h.update(path.encode('utf-8'))
+            h.update(b'\x00')
+        return h.hexdigest()
+
+    def _generate_image_hash(self, image: Image.Image) -> str:
+        """Hash the raw pixel buffer (plus size, mode and palette) without encoding to PNG."""
+        h = xxhash.xxh3_64()
+        h.update(f"{image.mode}:{image.width}x{image.height}".encode('utf-8'))
+        h.update(image.tobytes())
+
+        # P/PA pixels are palette indices - the colours live in the palette
+        palette = image.getpalette()
+        if palette is not None:
+            h.update(bytes(palette))
+        return h.hexdigest()
+
+    def _migrate_legacy_metadata(self):
+        """One-shot conversion of the legacy metadata.json array to metadata.jsonl."""
+        if not LEGACY_METADATA_FILE.exists() or self.metadata_path.exists():
+            return
 
-    def _read_metadata(self) -> list:
-        """Read existing metadata entries."""
         try:
-            if self.metadata_path.exists():
-                with open(self.metadata_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return []
-        except Exception as e:
-            print(f"[ClipboardWatcher] Error reading metadata: {e}")
-            return []
-
-    def _write_metadata(self, entries: list):
-        """Write metadata entries to file."""
+            entries = orjson.loads(LEGACY_METADATA_FILE.read_bytes())
+            if not isinstance(entries, list):
+                raise ValueError("expected a JSON array")
+        except ValueError as e:
+            invalid_path = LEGACY_METADATA_FILE.with_name(LEGACY_METADATA_FILE.name + '.invalid')
+            os.replace(LEGACY_METADATA_FILE, invalid_path)
+            print(f"[ClipboardWatcher] Legacy metadata is not valid ({e}), moved to {invalid_path}")
+            return
+
+        self._atomic_write(
+            self.metadata_path,
+            b"".join(orjson.dumps(entry) + b"\n" for entry in entries)
+        )
+
+        LEGACY_METADATA_FILE.unlink()
+        print(f"[ClipboardWatcher] Migrated {len(entries)} entries to {self.metadata_path}")
+
+    def _atomic_write(self, path: Path, data: bytes):
+        """Write to a .new file, fsync, then rename over the target."""
+        tmp_path = path.with_name(path.name + '.new')
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _count_metadata_entries(self) -> int:
+        """Count logged entries by counting newlines in 1 MiB chunks (no JSON parsing)."""
         try:
-            with open(self.metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(entries, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"[ClipboardWatcher] Error writing metadata: {e}")
+            with open(self.metadata_path, 'rb') as f:
+                return sum(chunk.count(b'\n') for chunk in iter(lambda: f.read(1 << 20), b''))
+        except FileNotFoundError:
+            return 0
 
     def _append_metadata_entry(self, entry: dict):
-        """Append new metadata entry (preserve existing entries)."""
+        """Append new metadata entry as a single JSON line (no read, no rewrite)."""
         try:
-            entries = self._read_metadata()
-            entries.append(entry)
-            self._write_metadata(entries)
+            with open(self.metadata_path, 'ab', buffering=1 << 16) as f:
+                f.write(orjson.dumps(entry) + b"\n")
         except Exception as e:
             print(f"[ClipboardWatcher] Error appending metadata: {e}")
 
-    def _cleanup_old_captures(self):
-        """Remove dedup entries older than the window."""
-        cutoff = datetime.now() - timedelta(seconds=DEDUP_WINDOW)
-        expired = [
-            h for h, ts in self.recent_captures.items()
-            if ts <= cutoff
-        ]
-        for h in expired:
-            del self.recent_captures[h]
-
-    def _is_duplicate(self, content_hash: str) -> bool:
-        """Check if content was captured within dedup window."""
-        now = datetime.now()
+    def _prune_captures(self, now: float):
+        """Drop expired hashes, at most once per DEDUP_WINDOW."""
+        if now - self.captures_pruned_at < DEDUP_WINDOW:
+            return
 
-        # Check if content was captured recently (within dedup window)
-        if content_hash in self.recent_captures:
-            last_captured = self.recent_captures[content_hash]
-            time_since = (now - last_captured).total_seconds()
+        self.recent_captures = {
+            h: ts for h, ts in self.recent_captures.items()
+            if now - ts < DEDUP_WINDOW
+        }
+        self.captures_pruned_at = now
 
-            # If captured within dedup window, it's a duplicate
-            if time_since < DEDUP_WINDOW:
-                return True
+    def _is_duplicate(self, content_hash: str) -> bool:
+        """Check if content was captured within the last DEDUP_WINDOW seconds."""
+        now = time.monotonic()
+        self._prune_captures(now)
 
-        # Clean up old entries periodically
-        self._cleanup_old_captures()
+        captured_at = self.recent_captures.get(content_hash)
+        if captured_at is not None and now - captured_at < DEDUP_WINDOW:
+            return True
 
-        # Mark this content as seen NOW to prevent race conditions
-        # This ensures that if the same content is checked again
-        # within the same poll or in rapid succession, it will be
-        # recognized as a duplicate
+        # Mark this content as seen NOW so a repeat within the same poll
+        # or in rapid succession is recognized as a duplicate
         self.recent_captures[content_hash] = now
         return False
 
@@ -182,38 +243,37 @@ class ClipboardWatcher:
 
         return entry
 
-    def _capture_image(self, image: Image.Image) -> dict | None:
+    def _capture_image(self, image: Image.Image, precomputed_hash: str = None) -> dict | None:
         """Capture image from clipboard."""
         if image is None:
             return None
 
-        # Generate hash from image bytes
-        import io
-        img_bytes = io.BytesIO()
-        image.save(img_bytes, format='PNG')
-        img_bytes.seek(0)
-        image_data = img_bytes.read()
-
-        content_hash = self._generate_content_hash(image_data)
+        # Reuse the hash poll_once already computed; PNG is only encoded once, below
+        content_hash = precomputed_hash or self._generate_image_hash(image)
 
         if self._is_duplicate(content_hash):
             return None
 
+        now = datetime.now()
+        captured_at = now.isoformat()
+
         # Save image file
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        filename = f"clip_{timestamp}.png"
+        filename = self._mint_filename("clip", "png", now)
         file_path = self.images_dir / filename
 
         try:
-            image.save(file_path, 'PNG')
+            # Encode once in memory, then write the same bytes to disk
+            buffer = io.BytesIO()
+            image.save(buffer, format='PNG', compress_level=PNG_COMPRESS_LEVEL)
+            png_bytes = buffer.getvalue()
+            file_path.write_bytes(png_bytes)
 
-            # Get file size
-            file_size = file_path.stat().st_size
+            file_size = len(png_bytes)
 
             # Create metadata entry with image details
             entry = {
                 "id": content_hash,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": captured_at,
                 "content_type": "image",
                 "content_preview": f"Image captured ({image.width}x{image.height}, {file_size} bytes)",
                 "file_path": str(file_path.relative_to(self.base_dir)),
@@ -238,12 +298,10 @@ class ClipboardWatcher:
 
     def _get_clipboard_image(self) -> Image.Image | None:
         """
-        Get image from clipboard.
-        Windows: Uses ImageGrab.grabclipboard()
-        macOS/Linux: Falls back gracefully (not implemented for this hackathon)
+        Get image from clipboard via ImageGrab.grabclipboard().
+        Used on macOS/Linux; Windows reads image formats in _read_clipboard_all.
         """
         try:
-            # Windows primary method
             image = ImageGrab.grabclipboard()
 
             # ImageGrab returns None for text, or Image for images
@@ -256,54 +314,110 @@ class ClipboardWatcher:
             # Silent failure - permission errors, unsupported platform, etc.
             return None
 
-    def _extract_urls(self, text: str) -> list:
-        """Extract URLs from text using regex."""
-        # URL pattern
-        url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+'
-        urls = re.findall(url_pattern, text)
-        return urls
+    def _get_clipboard_text(self) -> str | None:
+        """Get text from clipboard via pyperclip (macOS/Linux)."""
+        try:
+            return pyperclip.paste()
+        except Exception:
+            return None
 
-    def _is_url_only(self, text: str) -> bool:
-        """Check if text is ONLY a URL."""
-        text = text.strip()
+    def _decode_dib(self, dib_data: bytes) -> Image.Image | None:
+        """Decode a CF_DIB/CF_DIBV5 clipboard buffer (V5 headers keep the alpha channel)."""
         try:
-            result = urlparse(text)
-            return all([result.scheme, result.netloc]) and not any(c.isspace() for c in text)
-        except:
-            return False
+            image = BmpImagePlugin.DibImageFile(io.BytesIO(dib_data))
+            image.load()
+            return image
+        except Exception:
+            return None
+
+    def _decode_png(self, png_data: bytes) -> Image.Image | None:
+        """Decode the registered "PNG" clipboard format."""
+        try:
+            image = PngImagePlugin.PngImageFile(io.BytesIO(png_data))
+            image.load()
+            return image
+        except Exception:
+            return None
+
+    def _read_clipboard_image_data(self) -> tuple | None:
+        """
+        Copy the raw buffer of the best image format off the (already opened)
+        Windows clipboard: PNG, then CF_DIBV5, then CF_DIB (Windows synthesizes
+        the DIBs from CF_BITMAP), the same order ImageGrab.grabclipboard() uses.
+        Returns (decoder, bytes) or None; decoding happens after CloseClipboard.
+        """
+        if self.png_format and win32clipboard.IsClipboardFormatAvailable(self.png_format):
+            return self._decode_png, win32clipboard.GetClipboardData(self.png_format)
+
+        for fmt in (win32con.CF_DIBV5, win32con.CF_DIB):
+            if win32clipboard.IsClipboardFormatAvailable(fmt):
+                return self._decode_dib, win32clipboard.GetClipboardData(fmt)
+
+        return None
 
-    def _get_clipboard_files(self) -> list | None:
+    def _parse_file_list(self, file_data) -> list | None:
+        """Normalize CF_HDROP data (tuple of paths or NUL-separated string)."""
+        if isinstance(file_data, tuple):
+            files = list(file_data)
+        else:
+            files = file_data.split('\x00')
+
+        # Remove empty strings
+        files = [f for f in files if f]
+        return files if files else None
+
+    def _read_clipboard_all(self) -> tuple:
         """
-        Get file paths from clipboard (Windows only).
-        Returns list of file paths or None if no files.
+        Read files, image and text from the clipboard in a single pass.
+        Windows: opens the clipboard once and copies out CF_HDROP, the image
+        formats (see _read_clipboard_image_data) and CF_UNICODETEXT; images
+        are decoded after the clipboard is closed, so it is held only briefly.
+        macOS/Linux: ImageGrab for images, no file lists; text is left to
+        poll_once, which only reads it when no image was captured.
+        Returns (ok, files_or_none, image_or_none, text_or_none); ok is False
+        when the clipboard could not be opened, so the caller can retry.
         """
         if not WINDOWS_SUPPORT:
-            return None
+            return True, None, self._get_clipboard_image(), None
 
+        files = text = image_data = None
         try:
             win32clipboard.OpenClipboard()
             try:
-                # Check for file list format (CF_HDROP = 15)
-                if win32clipboard.IsClipboardFormatAvailable(15):
-                    file_data = win32clipboard.GetClipboardData(15)
-
-                    # Handle both string and tuple return types
-                    if isinstance(file_data, tuple):
-                        # Extract the actual data from tuple
-                        file_data = file_data[0] if file_data else ""
-
-                    # Parse file list
-                    files = file_data.split('\x00')
-                    # Remove empty strings and return
-                    files = [f for f in files if f and not f.endswith('\x00')]
-                    return files if files else None
+                if win32clipboard.IsClipboardFormatAvailable(win32con.CF_HDROP):
+                    files = self._parse_file_list(win32clipboard.GetClipboardData(win32con.CF_HDROP))
+
+                image_data = self._read_clipboard_image_data()
+
+                if win32clipboard.IsClipboardFormatAvailable(win32con.CF_UNICODETEXT):
+                    text = win32clipboard.GetClipboardData(win32con.CF_UNICODETEXT)
             finally:
                 win32clipboard.CloseClipboard()
-        except Exception as e:
-            # Silent failure - clipboard may be unavailable
-            pass
+        except Exception:
+            # Clipboard may be held by another process - report failure so the
+            # change is retried instead of being marked as handled
+            return False, None, None, None
 
-        return None
+        image = None
+        if image_data:
+            decode, data = image_data
+            image = decode(data)
+
+        return True, files, image, text
+
+    def _extract_urls(self, text: str) -> list:
+        """Extract URLs from text using regex."""
+        # Plain substring test is far cheaper than running the regex on prose
+        if '://' not in text:
+            return []
+        return URL_RE.findall(text)
+
+    def _is_url_only(self, text: str) -> bool:
+        """Check if text is ONLY a URL."""
+        if '://' not in text:
+            return False
+        text = text.strip()
+        return text[:8].lower().startswith(('http://', 'https://')) and URL_ONLY_RE.fullmatch(text) is not None
 
     def _capture_url(self, url: str) -> dict | None:
         """Capture URL from clipboard."""
@@ -330,47 +444,71 @@ class ClipboardWatcher:
 
         return entry
 
-    def _capture_files(self, files: list) -> dict | None:
+    def _copy_destinations(self, files: list) -> list:
+        """
+        Map each clipboard file to a copied_files/ path, suffixing repeated
+        basenames (a/readme.txt, b/readme.txt -> readme.txt, readme_2.txt)
+        so parallel copies never write the same file.
+        """
+        destinations = []
+        taken = set()  # lower-cased, as Windows names are case-insensitive
+        for original_path in files:
+            name = Path(original_path).name
+            stem, suffix = Path(name).stem, Path(name).suffix
+            count = 1
+            while name.lower() in taken:
+                count += 1
+                name = f"{stem}_{count}{suffix}"
+            taken.add(name.lower())
+            destinations.append(self.copied_files_dir / name)
+        return destinations
+
+    def _copy_file(self, original_path: str, copied_path: Path) -> str | None:
+        """Copy one clipboard file into copied_files/, returning its relative path."""
+        original_path_obj = Path(original_path)
+        try:
+            # copy2 already uses the platform's in-kernel copy (sendfile/fcopyfile)
+            # where one exists. No exists() pre-check: the copy's own open reports
+            # a missing file.
+            shutil.copy2(original_path_obj, copied_path)
+            print(f"  → Copied: {original_path_obj.name}")
+            return str(copied_path.relative_to(self.base_dir))
+        except FileNotFoundError:
+            print(f"  ⚠️  File not found: {original_path}")
+            return None
+        except Exception as e:
+            print(f"  ❌ Error copying {original_path}: {e}")
+            return None
+
+    def _capture_files(self, files: list, precomputed_hash: str = None) -> dict | None:
         """Capture file list from clipboard."""
         if not files:
             return None
 
-        # Create hash from sorted file list
-        files_str = '\x00'.join(sorted(files))
-        content_hash = self._generate_content_hash(files_str)
+        # Reuse the hash poll_once already computed for change detection
+        content_hash = precomputed_hash or self._hash_file_list(files)
 
         if self._is_duplicate(content_hash):
             return None
 
+        now = datetime.now()
+        captured_at = now.isoformat()
+
         # Save file list to JSON file in data/files/
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        filename = f"files_{timestamp}.json"
+        filename = self._mint_filename("files", "json", now)
         file_path = self.files_dir / filename
 
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "timestamp": datetime.now().isoformat(),
-                    "file_paths": files,
-                    "count": len(files)
-                }, f, indent=2, ensure_ascii=False)
-
-            # Copy actual files to data/copied_files/
-            copied_file_paths = []
-            for original_path in files:
-                try:
-                    import shutil
-                    original_path_obj = Path(original_path)
-                    if original_path_obj.exists():
-                        # Create same filename in copied_files directory
-                        copied_path = self.copied_files_dir / original_path_obj.name
-                        shutil.copy2(original_path_obj, copied_path)
-                        copied_file_paths.append(str(copied_path.relative_to(self.base_dir)))
-                        print(f"  → Copied: {original_path_obj.name}")
-                    else:
-                        print(f"  ⚠️  File not found: {original_path}")
-                except Exception as e:
-                    print(f"  ❌ Error copying {original_path}: {e}")
+            file_path.write_bytes(orjson.dumps({
+                "timestamp": captured_at,
+                "file_paths": files,
+                "count": len(files)
+            }, option=orjson.OPT_INDENT_2))
+
+            # Copy actual files to data/copied_files/ (I/O bound, so copy in parallel)
+            with ThreadPoolExecutor(max_workers=min(COPY_WORKERS, len(files))) as executor:
+                results = list(executor.map(self._copy_file, files, self._copy_destinations(files)))
+            copied_file_paths = [path for path in results if path]
 
             # Store file paths as comma-separated string for preview
             files_preview = ', '.join(files[:3])  # First 3 files
@@ -379,7 +517,7 @@ class ClipboardWatcher:
 
             entry = {
                 "id": content_hash,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": captured_at,
                 "content_type": "files",
                 "content_preview": f"Files copied: {files_preview}",
                 "file_path": str(file_path.relative_to(self.base_dir)),
@@ -398,79 +536,152 @@ class ClipboardWatcher:
 
     def poll_once(self):
         """Single polling iteration - check clipboard once."""
+        # Windows bumps a sequence number on every clipboard change; if it has not
+        # moved there is nothing new, so skip all format probes and hashing
+        seq = None
+        if WINDOWS_SUPPORT:
+            try:
+                seq = win32clipboard.GetClipboardSequenceNumber()
+                if seq == self.last_clipboard_seq:
+                    return
+            except Exception:
+                pass
+
+        # One clipboard read per pass for all formats
+        ok, current_files, current_image, current_text = self._read_clipboard_all()
+        if not ok:
+            return
+
+        # Only mark this change as handled once it has actually been read
+        if seq is not None:
+            self.last_clipboard_seq = seq
+
         # Track if we captured an image this cycle (to skip text capture)
         image_captured = False
 
         # Check for files first (Windows only)
-        if WINDOWS_SUPPORT:
+        if current_files:
             try:
-                current_files = self._get_clipboard_files()
-                if current_files:
-                    files_str = '\x00'.join(sorted(current_files))
-                    files_hash = self._generate_content_hash(files_str)
-
-                    if files_hash != self.last_files_hash:
-                        self._capture_files(current_files)
-                        self.last_files_hash = files_hash
+                files_hash = self._hash_file_list(current_files)
+
+                if files_hash != self.last_files_hash:
+                    self._capture_files(current_files, precomputed_hash=files_hash)
+                    self.last_files_hash = files_hash
             except Exception as e:
                 pass
 
         # Check for image BEFORE text (screenshots have both)
-        try:
-            current_image = self._get_clipboard_image()
-
-            if current_image:
+        if current_image:
+            try:
                 # Generate quick hash for comparison
-                import io
-                img_bytes = io.BytesIO()
-                current_image.save(img_bytes, format='PNG')
-                img_bytes.seek(0)
-                current_hash = self._generate_content_hash(img_bytes.read())
+                current_hash = self._generate_image_hash(current_image)
 
                 if current_hash != self.last_image_hash:
                     # Always update last_image_hash to prevent repeated checks
                     # The deduplication inside _capture_image will handle actual duplicate prevention
-                    result = self._capture_image(current_image)
+                    result = self._capture_image(current_image, precomputed_hash=current_hash)
                     if result:  # Image was successfully captured
                         image_captured = True
                     self.last_image_hash = current_hash
 
-        except Exception as e:
-            # Silent failure - clipboard may be unavailable
-            pass
+            except Exception as e:
+                pass
+
+        # Off Windows text is a separate read - only do it when it can be captured
+        if not image_captured and not WINDOWS_SUPPORT:
+            current_text = self._get_clipboard_text()
 
         # Check for text/URL (skip if image was just captured)
-        if not image_captured:
+        if not image_captured and current_text and current_text != self.last_text:
             try:
-                current_text = pyperclip.paste()
+                # Check if text is ONLY a URL
+                if self._is_url_only(current_text):
+                    self._capture_url(current_text)
+                # Otherwise capture as regular text
+                else:
+                    self._capture_text(current_text)
 
-                if current_text and current_text != self.last_text:
-                    # Check if text is ONLY a URL
-                    if self._is_url_only(current_text):
-                        self._capture_url(current_text)
-                    # Otherwise capture as regular text
-                    else:
-                        self._capture_text(current_text)
-
-                    self.last_text = current_text
+                self.last_text = current_text
 
             except Exception as e:
-                # Silent failure - clipboard may be unavailable
                 pass
 
+    def _create_listener_window(self):
+        """
+        Create a hidden message-only window registered for WM_CLIPBOARDUPDATE.
+        Windows only.
+        """
+        wc = win32gui.WNDCLASS()
+        wc.lpfnWndProc = self._wnd_proc
+        wc.lpszClassName = "MemoryOSClipboardListener"
+        wc.hInstance = win32api.GetModuleHandle(None)
+        class_atom = win32gui.RegisterClass(wc)
+
+        hwnd = win32gui.CreateWindowEx(
+            0, class_atom, "MemoryOS Clipboard Listener", 0,
+            0, 0, 0, 0, win32con.HWND_MESSAGE, 0, wc.hInstance, None
+        )
+        if not ctypes.windll.user32.AddClipboardFormatListener(hwnd):
+            win32gui.DestroyWindow(hwnd)
+            raise ctypes.WinError()
+
+        return hwnd
+
+    def _wnd_proc(self, hwnd, msg, wparam, lparam):
+        """Window procedure - runs a capture pass on every clipboard change."""
+        if msg == WM_CLIPBOARDUPDATE:
+            self.poll_once()
+            return 0
+        return win32gui.DefWindowProc(hwnd, msg, wparam, lparam)
+
+    def _poll_forever(self):
+        """Fixed-interval polling loop (macOS/Linux, or if the listener fails)."""
+        print(f"[ClipboardWatcher] Monitoring clipboard (interval: {POLL_INTERVAL}s)")
+        while True:
+            self.poll_once()
+            time.sleep(POLL_INTERVAL)
+
+    def _listen_forever(self):
+        """Event-driven loop: sleep until Windows reports a clipboard change."""
+        try:
+            hwnd = self._create_listener_window()
+        except Exception as e:
+            print(f"[ClipboardWatcher] Clipboard listener unavailable ({e}), polling instead")
+            self._poll_forever()
+            return
+
+        print("[ClipboardWatcher] Monitoring clipboard (change notifications)")
+        try:
+            # Pick up whatever is already on the clipboard
+            self.poll_once()
+            while True:
+                # Block until a message arrives; the 1s timeout keeps Ctrl+C responsive
+                # and retries a change whose read failed (the sequence-number check
+                # makes this a no-op when nothing is pending)
+                result = win32event.MsgWaitForMultipleObjects(
+                    [], False, int(POLL_INTERVAL * 1000), win32event.QS_ALLINPUT
+                )
+                if result == win32event.WAIT_TIMEOUT:
+                    self.poll_once()
+                else:
+                    win32gui.PumpWaitingMessages()
+        finally:
+            ctypes.windll.user32.RemoveClipboardFormatListener(hwnd)
+            win32gui.DestroyWindow(hwnd)
+
     def start(self):
         """Start the clipboard monitoring loop."""
-        print(f"[ClipboardWatcher] Monitoring clipboard (interval: {POLL_INTERVAL}s)")
         print("[ClipboardWatcher] Press Ctrl+C to stop")
 
         try:
-            while True:
-                self.poll_once()
-                time.sleep(POLL_INTERVAL)
+            if WINDOWS_SUPPORT:
+                self._listen_forever()
+            else:
+                self._poll_forever()
 
         except KeyboardInterrupt:
             print("\n[ClipboardWatcher] Stopped by user")
-            print(f"[ClipboardWatcher] Total captures: {len(self._read_metadata())}")
+            print(f"[ClipboardWatcher] Total captures: {self._count_metadata_entries()}")
         except Exception as e:
             print(f"[ClipboardWatcher] Unexpected error: {e}")
 
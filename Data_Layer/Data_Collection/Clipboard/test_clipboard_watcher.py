@@ -0,0 +1,190 @@
+"""
+Tests for the clipboard watcher
+Run with: pytest Data_Layer/Data_Collection/Clipboard
+"""
+
+import orjson
+import pytest
+from PIL import Image
+
+import clipboard_watcher
+from clipboard_watcher import ClipboardWatcher, DEDUP_WINDOW
+
+
+class FakeClock:
+    """Stand-in for time.monotonic() that tests can advance by hand."""
+
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(clipboard_watcher.time, "monotonic", fake)
+    return fake
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """Point the watcher's storage folders at a temp directory."""
+    storage = tmp_path / "Clipboard"
+    monkeypatch.setattr(clipboard_watcher, "METADATA_FILE", storage / "metadata.jsonl")
+    monkeypatch.setattr(clipboard_watcher, "LEGACY_METADATA_FILE", storage / "metadata.json")
+    monkeypatch.setattr(clipboard_watcher, "IMAGES_FOLDER", storage / "images")
+    monkeypatch.setattr(clipboard_watcher, "FILES_FOLDER", storage / "files")
+    monkeypatch.setattr(clipboard_watcher, "COPIED_FILES_FOLDER", storage / "copied_files")
+    return storage
+
+
+@pytest.fixture
+def watcher(tmp_path, storage, clock):
+    return ClipboardWatcher(base_dir=str(tmp_path))
+
+
+def test_repeat_within_window_is_duplicate(watcher, clock):
+    assert not watcher._is_duplicate("abc")
+    clock.now += DEDUP_WINDOW - 0.1
+    assert watcher._is_duplicate("abc")
+
+
+def test_repeat_after_window_is_captured(watcher, clock):
+    clock.now += 0.1
+    assert not watcher._is_duplicate("abc")
+
+    # Unrelated checks in between must not stretch the window for "abc"
+    clock.now += DEDUP_WINDOW - 0.2
+    assert not watcher._is_duplicate("other")
+
+    clock.now += 0.2
+    assert not watcher._is_duplicate("abc")
+
+
+def test_window_is_exact_regardless_of_prune_timing(watcher, clock):
+    clock.now += 0.1
+    assert not watcher._is_duplicate("abc")
+
+    clock.now += 2.8 * DEDUP_WINDOW
+    assert not watcher._is_duplicate("abc")
+
+
+def test_expired_hashes_are_pruned(watcher, clock):
+    assert not watcher._is_duplicate("abc")
+    clock.now += DEDUP_WINDOW
+    assert not watcher._is_duplicate("other")
+    assert "abc" not in watcher.recent_captures
+
+
+def test_palette_images_with_different_colours_hash_differently(watcher):
+    red = Image.new("P", (4, 4), 0)
+    red.putpalette([255, 0, 0])
+    blue = Image.new("P", (4, 4), 0)
+    blue.putpalette([0, 0, 255])
+
+    assert red.tobytes() == blue.tobytes()
+    assert watcher._generate_image_hash(red) != watcher._generate_image_hash(blue)
+
+
+@pytest.mark.parametrize("text", [
+    "https://example.com/path?q=1",
+    "  http://example.com  ",
+    "HTTPS://EXAMPLE.COM",
+    "Http://Example.com/Page",
+])
+def test_url_only_accepts_http_urls_in_any_case(watcher, text):
+    assert watcher._is_url_only(text)
+
+
+@pytest.mark.parametrize("text", [
+    "see https://example.com for details",
+    "ftp://example.com/file",
+    "just some prose",
+    "",
+])
+def test_url_only_rejects_other_text(watcher, text):
+    assert not watcher._is_url_only(text)
+
+
+def test_extract_urls_ignores_scheme_case(watcher):
+    text = "docs at HTTPS://Example.com/a and http://b.org"
+    assert watcher._extract_urls(text) == ["HTTPS://Example.com/a", "http://b.org"]
+
+
+def test_legacy_metadata_is_migrated_to_jsonl(tmp_path, storage):
+    entries = [{"id": "a", "content_type": "text"}, {"id": "b", "content_type": "url"}]
+    storage.mkdir(parents=True)
+    (storage / "metadata.json").write_bytes(orjson.dumps(entries))
+
+    watcher = ClipboardWatcher(base_dir=str(tmp_path))
+
+    lines = (storage / "metadata.jsonl").read_bytes().splitlines()
+    assert [orjson.loads(line) for line in lines] == entries
+    assert not (storage / "metadata.json").exists()
+    assert watcher._count_metadata_entries() == 2
+
+
+def test_invalid_legacy_metadata_is_kept_aside(tmp_path, storage):
+    storage.mkdir(parents=True)
+    (storage / "metadata.json").write_text("[{not json", encoding="utf-8")
+
+    watcher = ClipboardWatcher(base_dir=str(tmp_path))
+
+    assert (storage / "metadata.json.invalid").read_text(encoding="utf-8") == "[{not json"
+    assert not (storage / "metadata.json").exists()
+    assert watcher._count_metadata_entries() == 0
+
+
+def test_failed_migration_does_not_create_jsonl(tmp_path, storage, monkeypatch):
+    storage.mkdir(parents=True)
+    (storage / "metadata.json").write_bytes(orjson.dumps([{"id": "a"}]))
+
+    def fail(self, path, data):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(ClipboardWatcher, "_atomic_write", fail)
+    with pytest.raises(OSError):
+        ClipboardWatcher(base_dir=str(tmp_path))
+
+    # Left untouched, so the next start retries the migration
+    assert (storage / "metadata.json").exists()
+    assert not (storage / "metadata.jsonl").exists()
+
+
+def test_copy_destinations_suffixes_repeated_basenames(watcher):
+    files = ["a/readme.txt", "z/readme_2.txt", "b/README.txt", "c/readme.txt", "d/notes"]
+
+    names = [path.name for path in watcher._copy_destinations(files)]
+
+    assert names == ["readme.txt", "readme_2.txt", "README_3.txt", "readme_4.txt", "notes"]
+    assert all(path.parent == watcher.copied_files_dir for path in watcher._copy_destinations(files))
+
+
+def test_capture_files_keeps_same_named_files_apart(tmp_path, watcher):
+    sources = []
+    for folder in ("a", "b"):
+        (tmp_path / folder).mkdir()
+        source = tmp_path / folder / "readme.txt"
+        source.write_text(f"from {folder}", encoding="utf-8")
+        sources.append(str(source))
+
+    entry = watcher._capture_files(sources)
+
+    copied = sorted(watcher.copied_files_dir.iterdir())
+    assert [path.name for path in copied] == ["readme.txt", "readme_2.txt"]
+    assert sorted(path.read_text(encoding="utf-8") for path in copied) == ["from a", "from b"]
+    assert len(entry["copied_files"]) == 2
+
+
+def test_filename_counter_resumes_after_restart(tmp_path, storage, clock):
+    first = ClipboardWatcher(base_dir=str(tmp_path))
+    first._append_metadata_entry({"id": "a"})
+    first._append_metadata_entry({"id": "b"})
+
+    second = ClipboardWatcher(base_dir=str(tmp_path))
+
+    assert second._count_metadata_entries() == 2
+    now = clipboard_watcher.datetime(2026, 1, 2, 3, 4, 5)
+    assert second._mint_filename("clip", "png", now) == "clip_20260102_030405_000003.png"
@@ -4,15 +4,17 @@
 Monitors Gmail for new emails and stores them in standardized MemoryOS schema.
 """
 import os
-import json
 import hashlib
+import time
 import base64
 import email
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from pathlib import Path
-import pickle
 from email.header import decode_header
 
+import orjson
+
 # Google Gmail API libraries
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
@@ -21,13 +23,15 @@ from googleapiclient.discovery import build
 
 # Configuration
 SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
-TOKEN_FILE = 'token.pickle'
+TOKEN_FILE = 'token.json'
 CREDENTIALS_FILE = 'credentials.json'
 POLL_INTERVAL = 300  # Check every 5 minutes
 LOOKBACK_MINUTES = 10  # Look back 10 minutes for new emails
+SEEN_EMAILS_LIMIT = 1000  # Message ids kept for dedup (one lookback fetches at most 20)
 DATA_STORAGE = Path(__file__).parent.parent.parent / "Data_Storage"
 EMAILS_DIR = DATA_STORAGE / "Email" / "emails"
-METADATA_FILE = DATA_STORAGE / "Email" / "metadata.json"
+METADATA_FILE = DATA_STORAGE / "Email" / "metadata.jsonl"
+LEGACY_METADATA_FILE = DATA_STORAGE / "Email" / "metadata.json"
 
 
 class EmailWatcher:
@@ -42,7 +46,8 @@ class EmailWatcher:
         self.token_file = self.base_dir / TOKEN_FILE
 
         self.service = None
-        self.seen_emails = {}  # message_id: last_seen_timestamp
+        self.seen_emails = OrderedDict()  # message_id -> None, least recently seen first
+        self.total_emails = 0
 
         self._setup_directories()
         self._authenticate()
@@ -50,17 +55,49 @@ class EmailWatcher:
     def _setup_directories(self):
         """Create necessary directories."""
         self.emails_dir.mkdir(parents=True, exist_ok=True)
+        self._migrate_legacy_metadata()
         print(f"[EmailWatcher] Emails -> {self.emails_dir.absolute()}")
         print(f"[EmailWatcher] Metadata -> {self.metadata_file.absolute()}")
 
+    def _migrate_legacy_metadata(self):
+        """One-shot conversion of the legacy metadata.json array to metadata.jsonl."""
+        if not LEGACY_METADATA_FILE.exists() or self.metadata_file.exists():
+            return
+
+        try:
+            metadata = orjson.loads(LEGACY_METADATA_FILE.read_bytes())
+            if not isinstance(metadata, list):
+                raise ValueError("expected a JSON array")
+        except ValueError as e:
+            invalid_path = LEGACY_METADATA_FILE.with_name(LEGACY_METADATA_FILE.name + '.invalid')
+            os.replace(LEGACY_METADATA_FILE, invalid_path)
+            print(f"[EmailWatcher] Legacy metadata is not valid ({e}), moved to {invalid_path}")
+            return
+
+        self._atomic_write(
+            self.metadata_file,
+            b"".join(orjson.dumps(entry) + b"\n" for entry in metadata)
+        )
+
+        LEGACY_METADATA_FILE.unlink()
+        print(f"[EmailWatcher] Migrated {len(metadata)} entries to {self.metadata_file}")
+
+    def _atomic_write(self, path: Path, data: bytes):
+        """Write to a .new file, fsync, then rename over the target."""
+        tmp_path = path.with_name(path.name + '.new')
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
     def _authenticate(self):
         """Authenticate with Gmail API."""
         creds = None
 
         # Load existing token if available
         if self.token_file.exists():
-            with open(self.token_file, 'rb') as token:
-                creds = pickle.load(token)
+            creds = Credentials.from_authorized_user_file(str(self.token_file), SCOPES)
 
         # If no valid credentials, get new ones
         if not creds or not creds.valid:
@@ -81,8 +118,7 @@ class EmailWatcher:
                 creds = flow.run_local_server(port=0)
 
             # Save credentials for next run
-            with open(self.token_file, 'wb') as token:
-                pickle.dump(creds, token)
+            self.token_file.write_text(creds.to_json(), encoding='utf-8')
 
         self.service = build('gmail', 'v1', credentials=creds)
         print("[EmailWatcher] Authenticated with Gmail")
@@ -103,8 +139,14 @@ class EmailWatcher:
     def _is_duplicate(self, message_id: str) -> bool:
         """Check if email has already been captured."""
         if message_id in self.seen_emails:
+            # Refresh on hit so ids still inside the lookback window are evicted last
+            self.seen_emails.move_to_end(message_id)
             return True
-        self.seen_emails[message_id] = datetime.now()
+
+        # Bounded LRU: ids older than the lookback window can never be fetched again
+        self.seen_emails[message_id] = None
+        if len(self.seen_emails) > SEEN_EMAILS_LIMIT:
+            self.seen_emails.popitem(last=False)
         return False
 
     def _create_email_hash(self, message):
@@ -138,7 +180,8 @@ class EmailWatcher:
         """Save email to individual JSON file and update metadata."""
         message_id = message.get('id')
         email_hash = self._create_email_hash(message)
-        timestamp = datetime.now().isoformat()
+        now = datetime.now()
+        timestamp = now.isoformat()
 
         # Extract email headers
         payload = message.get('payload', {})
@@ -162,11 +205,10 @@ class EmailWatcher:
         }
 
         # Save individual email file
-        email_filename = f"email_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{email_hash[:8]}.json"
+        email_filename = f"email_{now:%Y%m%d_%H%M%S}_{email_hash[:8]}.json"
         email_path = self.emails_dir / email_filename
 
-        with open(email_path, 'w', encoding='utf-8') as f:
-            json.dump(email_data, f, indent=2, ensure_ascii=False)
+        email_path.write_bytes(orjson.dumps(email_data, option=orjson.OPT_INDENT_2))
 
         # Create metadata entry (MemoryOS standard schema)
         metadata_entry = {
@@ -187,26 +229,15 @@ class EmailWatcher:
             }
         }
 
-        # Update metadata.json
+        # Update metadata.jsonl
         self._update_metadata(metadata_entry)
 
         return email_filename
 
     def _update_metadata(self, entry):
-        """Append entry to metadata.json."""
-        metadata = []
-
-        if self.metadata_file.exists():
-            with open(self.metadata_file, 'r', encoding='utf-8') as f:
-                try:
-                    metadata = json.load(f)
-                except json.JSONDecodeError:
-                    metadata = []
-
-        metadata.append(entry)
-
-        with open(self.metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        """Append entry to metadata.jsonl as a single JSON line."""
+        with open(self.metadata_file, 'ab', buffering=1 << 16) as f:
+            f.write(orjson.dumps(entry) + b"\n")
 
     def _fetch_emails(self):
         """Fetch emails from Gmail."""
@@ -256,6 +287,8 @@ class EmailWatcher:
                 print(f"  -> Captured: {subject}")
                 new_emails += 1
 
+        self.total_emails += new_emails
+
         if new_emails == 0:
             print(f"  -> No new emails found")
         else:
@@ -273,12 +306,11 @@ class EmailWatcher:
         try:
             while True:
                 self.poll_once()
-                import time
                 time.sleep(POLL_INTERVAL)
 
         except KeyboardInterrupt:
             print(f"\n[EmailWatcher] Stopped by user")
-            print(f"[EmailWatcher] Total emails captured: {len(self.seen_emails)}")
+            print(f"[EmailWatcher] Total emails captured: {self.total_emails}")
 
 
 def main():